@@ -0,0 +1,138 @@
+import math
+import threading
+from collections import deque
+
+import pandas as pd
+
+
+class SeasonalAnomalyDetector:
+    """
+    Detektor anomali streaming dengan baseline musiman.
+    Setiap slot musiman (misalnya jam dalam seminggu) menyimpan rata-rata dan
+    varians bergerak eksponensial, sehingga setiap data baru diproses dalam O(1)
+    dan memori tetap terbatas.
+    """
+
+    def __init__(self, period, alpha=0.1, threshold=3.0, min_periods=4, max_anomalies=1000):
+        self.period = period
+        self.alpha = alpha
+        self.threshold = threshold
+        self.min_periods = min_periods
+
+        # Statistik per slot: jumlah observasi, rata-rata, dan varians
+        self._count = [0] * period
+        self._mean = [0.0] * period
+        self._var = [0.0] * period
+
+        # Hanya anomali terbaru yang disimpan agar memori tidak bertambah terus
+        self._anomalies = deque(maxlen=max_anomalies)
+        self._lock = threading.Lock()
+        self.last_timestamp = None
+
+    def update(self, slot, timestamp, value):
+        """
+        Fungsi untuk memproses satu data baru.
+        Mengembalikan skor z jika data tersebut anomali, selain itu None.
+        """
+        with self._lock:
+            return self._update(slot, timestamp, value)
+
+    def _update(self, slot, timestamp, value):
+        count = self._count[slot]
+        mean = self._mean[slot]
+        # Batas bawah simpangan baku mengikuti derau Poisson pada data hitungan,
+        # agar slot dengan penyewaan sangat kecil tidak terlalu sensitif
+        std = max(math.sqrt(self._var[slot]), math.sqrt(max(mean, 1.0)))
+        score = None
+
+        # Bandingkan dengan baseline sebelum baseline diperbarui
+        if count >= self.min_periods:
+            z = (value - mean) / std
+            if abs(z) >= self.threshold:
+                score = z
+                self._anomalies.append({
+                    'timestamp': timestamp,
+                    'slot': slot,
+                    'value': value,
+                    'expected': mean,
+                    'score': z,
+                    'type': 'Lonjakan' if z > 0 else 'Penurunan'
+                })
+
+        # Batasi nilai anomali agar tidak merusak baseline
+        if score is not None:
+            limit = self.threshold * std
+            value = min(max(value, mean - limit), mean + limit)
+
+        if count == 0:
+            self._mean[slot] = float(value)
+        else:
+            diff = value - mean
+            incr = self.alpha * diff
+            self._mean[slot] = mean + incr
+            self._var[slot] = (1 - self.alpha) * (self._var[slot] + diff * incr)
+        self._count[slot] = count + 1
+        self.last_timestamp = timestamp
+        return score
+
+    def ingest(self, timestamps, slots, values):
+        """
+        Fungsi untuk memproses sekumpulan data secara berurutan.
+        Data yang sudah pernah diproses (timestamp <= last_timestamp) dilewati,
+        sehingga riwayat tidak dihitung ulang pada setiap rerun.
+        """
+        with self._lock:
+            new_count = 0
+            for timestamp, slot, value in zip(timestamps, slots, values):
+                if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+                    continue
+                self._update(int(slot), timestamp, float(value))
+                new_count += 1
+            return new_count
+
+    def anomalies(self, start=None, end=None, min_score=None, kind=None):
+        """
+        Fungsi untuk mengambil daftar anomali yang terdeteksi.
+        Dapat difilter berdasarkan rentang waktu, skor minimum, dan jenis anomali.
+        """
+        with self._lock:
+            records = list(self._anomalies)
+
+        df = pd.DataFrame(records, columns=['timestamp', 'slot', 'value', 'expected', 'score', 'type'])
+        if start is not None:
+            df = df[df['timestamp'] >= start]
+        if end is not None:
+            df = df[df['timestamp'] <= end]
+        if min_score is not None:
+            df = df[df['score'].abs() >= min_score]
+        if kind is not None:
+            df = df[df['type'] == kind]
+        return df.reset_index(drop=True)
+
+
+def hourly_detector_input(hour_df):
+    """
+    Fungsi untuk menyiapkan deret waktu per jam beserta slot jam dalam seminggu (0-167).
+    """
+    timestamps = hour_df['dteday'] + pd.to_timedelta(hour_df['hour'], unit='h')
+    slots = hour_df['dteday'].dt.dayofweek * 24 + hour_df['hour']
+    return timestamps, slots, hour_df['total_rentals']
+
+
+def daily_detector_input(day_df):
+    """
+    Fungsi untuk menyiapkan deret waktu harian beserta slot hari dalam seminggu (0-6).
+    """
+    return day_df['dteday'], day_df['dteday'].dt.dayofweek, day_df['total_rentals']
+
+
+def feed_detector(detector, timestamps, slots, values):
+    """
+    Fungsi untuk mengirim hanya data baru ke detektor.
+    Data lama dipotong secara vektor sebelum diproses satu per satu.
+    """
+    if detector.last_timestamp is not None:
+        mask = (timestamps > detector.last_timestamp).to_numpy()
+        timestamps, slots, values = timestamps[mask], slots[mask], values[mask]
+    order = timestamps.argsort().to_numpy()
+    return detector.ingest(timestamps.iloc[order], slots.iloc[order], values.iloc[order])
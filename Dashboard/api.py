@@ -0,0 +1,261 @@
+"""
+Layanan query agregat lokal (HTTP/JSON) untuk dashboard penyewaan sepeda.
+Menggunakan logika pemuatan dan agregasi yang sama dengan dashboard Streamlit.
+
+Jalankan dengan:
+    python Dashboard/api.py --port 8502
+"""
+import argparse
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import data_processing
+from data_processing import FILTER_OPTIONS
+from sufficient_stats import SufficientStatsStore
+
+
+def to_jsonable(obj):
+    """
+    Fungsi untuk mengubah hasil agregasi (DataFrame, numpy, Timestamp) menjadi struktur JSON.
+    Nilai NaN diubah menjadi None.
+    """
+    if isinstance(obj, pd.DataFrame):
+        return [to_jsonable(record) for record in obj.to_dict(orient='records')]
+    if isinstance(obj, dict):
+        return {str(key): to_jsonable(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_jsonable(value) for value in obj]
+    if isinstance(obj, (pd.Timestamp, datetime)):
+        return obj.isoformat()
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, (float, np.floating)):
+        return None if math.isnan(obj) else float(obj)
+    return obj
+
+
+class ResponseCache:
+    """
+    Cache respons LRU yang aman untuk banyak thread.
+    Setiap entri menyimpan body JSON beserta ETag-nya.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, body):
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        with self._lock:
+            self._entries[key] = (body, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body, etag
+
+
+class AggregateService:
+    """
+    Layanan agregasi yang memuat data sekali lalu menjawab query per filter.
+    """
+
+    def __init__(self, base_path=data_processing.DATA_DIR, cache_size=512):
+        self.day_df, self.hour_df = data_processing.load_data(base_path)
+        self.stats_store = SufficientStatsStore(self.day_df)
+        self.cache = ResponseCache(cache_size)
+        self.endpoints = {
+            'kpis': self.kpis,
+            'hourly_count': self.hourly_count,
+            'season_avg': self.season_avg,
+            'weather_means': self.weather_means,
+            'heatmap': self.heatmap,
+            'correlation': self.correlation,
+            'summary': self.summary,
+        }
+
+    def kpis(self, filtered_day_df, filtered_hour_df, filters):
+        return data_processing.compute_kpis(filtered_day_df)
+
+    def hourly_count(self, filtered_day_df, filtered_hour_df, filters):
+        return data_processing.hourly_rentals(filtered_hour_df)
+
+    def season_avg(self, filtered_day_df, filtered_hour_df, filters):
+        _, season_avg = data_processing.season_rentals(filtered_day_df)
+        return season_avg
+
+    def weather_means(self, filtered_day_df, filtered_hour_df, filters):
+        return data_processing.weather_rentals(filtered_day_df)
+
+    def heatmap(self, filtered_day_df, filtered_hour_df, filters):
+        heatmap_data = data_processing.hour_weekday_heatmap(filtered_hour_df)
+        return {
+            'hours': heatmap_data.index.tolist(),
+            'days': heatmap_data.columns.tolist(),
+            'values': heatmap_data.to_numpy().tolist()
+        }
+
+    def correlation(self, filtered_day_df, filtered_hour_df, filters):
+        correlation_matrix = self.stats_store.correlation_matrix(**data_processing.column_filters(**filters))
+        return {
+            'columns': correlation_matrix.columns.tolist(),
+            'values': correlation_matrix.to_numpy().tolist()
+        }
+
+    def summary(self, filtered_day_df, filtered_hour_df, filters):
+        return {
+            name: handler(filtered_day_df, filtered_hour_df, filters)
+            for name, handler in self.endpoints.items() if name != 'summary'
+        }
+
+    def parse_filters(self, query):
+        """
+        Fungsi untuk membaca dan memvalidasi parameter filter dari query string.
+        """
+        params = parse_qs(query)
+        unknown = set(params) - set(FILTER_OPTIONS)
+        if unknown:
+            raise ValueError(f"Parameter tidak dikenal: {', '.join(sorted(unknown))}")
+        filters = {}
+        for name, options in FILTER_OPTIONS.items():
+            value = params.get(name, ['Semua'])[-1]
+            if value not in options:
+                raise ValueError(f"Nilai '{value}' tidak valid untuk parameter '{name}'")
+            filters[name] = value
+        return filters
+
+    def respond(self, endpoint, filters):
+        """
+        Fungsi untuk menghasilkan (body, etag) sebuah endpoint, memakai cache jika tersedia.
+        """
+        key = (endpoint, tuple(filters[name] for name in FILTER_OPTIONS))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        filtered_day_df, filtered_hour_df = data_processing.filter_data(self.day_df, self.hour_df, **filters)
+        result = self.endpoints[endpoint](filtered_day_df, filtered_hour_df, filters)
+        body = json.dumps({'filters': filters, 'data': to_jsonable(result)},
+                          ensure_ascii=False, allow_nan=False).encode('utf-8')
+        return self.cache.put(key, body)
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Fungsi untuk memeriksa header If-None-Match terhadap ETag respons.
+    """
+    if if_none_match is None:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or any(tag.removeprefix('W/') == etag for tag in candidates)
+
+
+def make_handler(service):
+    """
+    Fungsi untuk membuat kelas handler HTTP yang terhubung ke layanan agregasi.
+    """
+
+    class AggregateRequestHandler(BaseHTTPRequestHandler):
+        # HTTP/1.1 agar koneksi keep-alive dapat dipakai ulang oleh klien
+        protocol_version = 'HTTP/1.1'
+        # Header dan body dikirim tanpa jeda Nagle agar latensi keep-alive rendah
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            parts = url.path.strip('/').split('/')
+
+            if url.path == '/api/filters':
+                self._send_json(200, json.dumps(FILTER_OPTIONS, ensure_ascii=False).encode('utf-8'))
+                return
+            if len(parts) != 2 or parts[0] != 'api' or parts[1] not in service.endpoints:
+                self._send_error(404, f"Endpoint tidak ditemukan: {url.path}")
+                return
+
+            try:
+                filters = service.parse_filters(url.query)
+            except ValueError as e:
+                self._send_error(400, str(e))
+                return
+
+            body, etag = service.respond(parts[1], filters)
+            if etag_matches(self.headers.get('If-None-Match'), etag):
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'max-age=60')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self._send_json(200, body, etag)
+
+        def _send_json(self, status, body, etag=None):
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            if etag is not None:
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'max-age=60')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_error(self, status, message):
+            self._send_json(status, json.dumps({'error': message}, ensure_ascii=False).encode('utf-8'))
+
+        def log_message(self, format, *args):
+            # Log per request dimatikan agar tidak membebani throughput
+            pass
+
+    return AggregateRequestHandler
+
+
+def create_server(host='127.0.0.1', port=8502, base_path=data_processing.DATA_DIR, cache_size=512):
+    """
+    Fungsi untuk membuat server HTTP multi-thread beserta layanan agregasinya.
+    """
+    service = AggregateService(base_path, cache_size)
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    return server, service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Layanan query agregat penyewaan sepeda")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--data-dir', default=data_processing.DATA_DIR)
+    parser.add_argument('--cache-size', type=int, default=512)
+    args = parser.parse_args()
+
+    server, _ = create_server(args.host, args.port, args.data_dir, args.cache_size)
+    print(f"Layanan query berjalan di http://{args.host}:{args.port}/api/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
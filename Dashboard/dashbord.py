@@ -1,13 +1,33 @@
+import time
+_script_start = time.perf_counter()
+
 import streamlit as st
+from startup import LazyModule, StartupProfiler, read_asset
+
+# Profiler startup, laporan ditampilkan jika DASHBOARD_PROFILE_STARTUP=1
+profiler = StartupProfiler(_script_start)
+
+_import_start = time.perf_counter()
 import numpy as np
 import pandas as pd
-import matplotlib
-matplotlib.use('Agg')  # Pengaturan backend non-GUI
-import matplotlib.pyplot as plt
-import seaborn as sns
+profiler.record_import("numpy, pandas", time.perf_counter() - _import_start)
 import os
 from datetime import datetime
 
+from anomaly import (SeasonalAnomalyDetector, hourly_detector_input,
+                     daily_detector_input, feed_detector)
+from sufficient_stats import SufficientStatsStore
+from quantile_sketch import QuantileSketchStore, quantile_table, box_stats, violin_stats
+import data_processing
+
+# Library plotting baru diimpor saat grafik pertama dibuat
+def _use_agg_backend():
+    import matplotlib
+    matplotlib.use('Agg')  # Pengaturan backend non-GUI
+
+plt = LazyModule("matplotlib.pyplot", setup=_use_agg_backend, profiler=profiler)
+sns = LazyModule("seaborn", setup=_use_agg_backend, profiler=profiler)
+
 # Konfigurasi halaman dengan tema yang lebih menarik
 st.set_page_config(
     page_title="Dashboard Penyewaan Sepeda",
@@ -16,44 +36,22 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Menambahkan CSS untuk mempercantik tampilan
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 36px;
-        font-weight: bold;
-        color: #1E88E5;
-        text-align: center;
-        margin-bottom: 20px;
-        padding-bottom: 10px;
-        border-bottom: 2px solid #1E88E5;
-    }
-    .sub-header {
-        font-size: 24px;
-        font-weight: bold;
-        color: #43A047;
-        margin-top: 30px;
-        margin-bottom: 15px;
-    }
-    .highlight {
-        background-color: #f0f7ff;
-        padding: 15px;
-        border-radius: 5px;
-        border-left: 5px solid #1E88E5;
-    }
-    .metric-card {
-        background-color: #f5f5f5;
-        padding: 10px;
-        border-radius: 5px;
-        box-shadow: 2px 2px 5px rgba(0,0,0,0.1);
-    }
-    .stPlotlyChart {
-        box-shadow: 2px 2px 5px rgba(0,0,0,0.1);
-        border-radius: 5px;
-        padding: 5px;
+# Aset statis (CSS dan logo) dibaca dari folder lokal sekali per proses
+@st.cache_resource
+def load_static_assets():
+    """
+    Fungsi untuk memuat aset statis yang dibundel bersama dashboard.
+    Tidak membutuhkan koneksi jaringan keluar.
+    """
+    return {
+        "style": "<style>\n" + read_asset("style.css") + "\n</style>",
+        "logo": read_asset("logo.svg"),
     }
-</style>
-""", unsafe_allow_html=True)
+
+static_assets = load_static_assets()
+
+# Menambahkan CSS untuk mempercantik tampilan
+st.markdown(static_assets["style"], unsafe_allow_html=True)
 
 # Fungsi untuk memuat dan mempersiapkan data dengan caching
 @st.cache_data
@@ -62,149 +60,85 @@ def load_data():
     Fungsi untuk memuat dan mempersiapkan data.
     Menggunakan cache untuk meningkatkan performa.
     """
-    # Baca data dari file CSV
-    base_path = "Dashboard"
-    day_df = pd.read_csv(os.path.join(base_path, "day_df.csv"))
-    hour_df = pd.read_csv(os.path.join(base_path, "hour_df.csv"))
-    
-    # Hapus kolom yang tidak diperlukan
-    for df in [day_df, hour_df]:
-        df.drop(['workingday'], axis=1, inplace=True)
-    
-    # Ubah tipe data kolom kategori
-    kategori_kolom = ['season', 'mnth', 'holiday', 'weekday', 'weathersit']
-    for df in [day_df, hour_df]:
-        for col in kategori_kolom:
-            df[col] = df[col].astype("category")
-    
-    # Konversi kolom tanggal ke tipe datetime
-    for df in [day_df, hour_df]:
-        df['dteday'] = pd.to_datetime(df['dteday'])
-    
-    # Ganti nama kolom untuk meningkatkan keterbacaan
-    rename_dict = {
-        'yr': 'year',
-        'mnth': 'month',
-        'weekday': 'day_of_week',
-        'weathersit': 'weather_situation',
-        'windspeed': 'wind_speed',
-        'cnt': 'total_rentals',
-        'hum': 'humidity',
-        'temp': 'temperature',
-        'casual': 'casual_users',
-        'registered': 'registered_users'
-    }
-    day_df.rename(columns=rename_dict, inplace=True)
-    hour_df.rename(columns={**rename_dict, 'hr': 'hour'}, inplace=True)
-    
-    # Buat pemetaan untuk nilai kategori
-    mapping_dict = {
-        'season': {1: 'Spring', 2: 'Summer', 3: 'Fall', 4: 'Winter'},
-        'month': {i: month for i, month in enumerate(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-                                                       'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'], 1)},
-        'weather_situation': {1: 'Cerah', 2: 'Berkabut', 3: 'Hujan/Salju Ringan', 4: 'Hujan/Salju Lebat'},
-        'day_of_week': {0: 'Minggu', 1: 'Senin', 2: 'Selasa', 3: 'Rabu',
-                        4: 'Kamis', 5: 'Jumat', 6: 'Sabtu'},
-        'year': {0: '2011', 1: '2012'},
-        'holiday': {0: 'Hari Biasa', 1: 'Hari Libur'}
-    }
-    
-    # Terapkan pemetaan ke data
-    for col, mapping in mapping_dict.items():
-        # Pastikan kolom bertipe kategori
-        if col in day_df.columns:
-            if not isinstance(day_df[col].dtype, pd.CategoricalDtype):
-                day_df[col] = day_df[col].astype("category")
-            day_df[col] = day_df[col].cat.rename_categories(mapping)
+    return data_processing.load_data()
 
-        if col in hour_df.columns:
-            if not isinstance(hour_df[col].dtype, pd.CategoricalDtype):
-                hour_df[col] = hour_df[col].astype("category")
-            hour_df[col] = hour_df[col].cat.rename_categories(mapping)
+# Detektor anomali disimpan sebagai resource agar baseline bertahan antar rerun
+@st.cache_resource
+def get_anomaly_detectors():
+    """
+    Fungsi untuk membuat detektor anomali per jam (baseline jam dalam seminggu)
+    dan harian (baseline hari dalam seminggu).
+    """
+    hourly_detector = SeasonalAnomalyDetector(period=7 * 24, alpha=0.1, threshold=4.0)
+    daily_detector = SeasonalAnomalyDetector(period=7, alpha=0.2, threshold=3.5)
+    return hourly_detector, daily_detector
 
+# Statistik cukup per sel filter, dibangun sekali dari data harian
+@st.cache_resource
+def get_stats_store(_day_df):
+    """
+    Fungsi untuk membangun penyimpanan statistik cukup untuk analisis korelasi.
+    """
+    return SufficientStatsStore(_day_df)
 
-    
-    # Fungsi untuk mengkategorikan hari (Weekday/Weekend)
-    def categorize_day(day):
-        return "Akhir Pekan" if day in ["Sabtu", "Minggu"] else "Hari Kerja"
-    
-    # Terapkan kategorisasi hari
-    for df in [day_df, hour_df]:
-        df["day_category"] = df["day_of_week"].apply(categorize_day)
-    
-    # Fungsi untuk mengkategorikan kelembaban
-    def categorize_humidity(hum):
-        if hum < 45:
-            return "Kering"
-        elif hum < 65:
-            return "Ideal"
-        else:
-            return "Lembab"
-    
-    # Terapkan kategorisasi kelembaban
-    for df in [day_df, hour_df]:
-        df["humidity_category"] = df["humidity"].apply(categorize_humidity)
-    
-    # Fungsi untuk mengkategorikan suhu
-    def categorize_temperature(temp):
-        # Mengkonversi suhu normalisasi ke Celsius (temp * 41)
-        temp_celsius = temp * 41
-        if temp_celsius < 15:
-            return "Dingin"
-        elif temp_celsius < 25:
-            return "Nyaman"
-        else:
-            return "Panas"
-    
-    # Terapkan kategorisasi suhu
-    for df in [day_df, hour_df]:
-        df["temperature_category"] = df["temperature"].apply(categorize_temperature)
-        # Menambahkan kolom suhu dalam Celsius untuk visualisasi yang lebih jelas
-        df["temperature_celsius"] = df["temperature"] * 41
-    
-    return day_df, hour_df
+# Sketsa kuantil per jam x sel filter, diperbarui secara inkremental
+@st.cache_resource
+def get_quantile_store():
+    """
+    Fungsi untuk membuat penyimpanan sketsa kuantil penyewaan per jam.
+    """
+    return QuantileSketchStore()
+
+# Sel agregat untuk mode perbandingan, dibangun sekali dalam satu pass groupby
+@st.cache_resource
+def get_segment_cells(_day_df, _hour_df):
+    """
+    Fungsi untuk membangun sel agregat yang dipakai bersama oleh semua segmen perbandingan.
+    """
+    return data_processing.build_segment_cells(_day_df, _hour_df)
 
 # Muat data
 day_df, hour_df = load_data()
+stats_store = get_stats_store(day_df)
+
+# Perbarui sketsa kuantil, hanya data baru yang diproses
+quantile_store = get_quantile_store()
+quantile_store.ingest(hour_df)
+
+# Perbarui detektor anomali, hanya data baru yang diproses
+hourly_detector, daily_detector = get_anomaly_detectors()
+feed_detector(hourly_detector, *hourly_detector_input(hour_df))
+feed_detector(daily_detector, *daily_detector_input(day_df))
 
 # Sidebar untuk filter
 st.sidebar.markdown("## 🔍 Filter Data")
 with st.sidebar:
-    st.image("https://cdn-icons-png.flaticon.com/512/2972/2972185.png", width=100)
+    st.image(static_assets["logo"], width=100)
+    
+    # Pilihan filter bersama (data_processing), dipakai juga oleh mode perbandingan
+    filter_options = data_processing.FILTER_OPTIONS
+    filter_labels = {
+        'tahun': "Pilih Tahun",
+        'musim': "Pilih Musim",
+        'tipe_hari': "Pilih Tipe Hari",
+        'cuaca': "Pilih Cuaca",
+        'bulan': "Pilih Bulan"
+    }
     
     # Filter tahun
-    tahun = st.selectbox("Pilih Tahun", ['Semua', '2011', '2012'])
-    filtered_day_df = day_df
-    filtered_hour_df = hour_df
-    
-    if tahun != 'Semua':
-        filtered_day_df = filtered_day_df[filtered_day_df['year'] == tahun]
-        filtered_hour_df = filtered_hour_df[filtered_hour_df['year'] == tahun]
+    tahun = st.selectbox(filter_labels['tahun'], filter_options['tahun'])
     
     # Filter musim
-    musim = st.selectbox("Pilih Musim", ['Semua', 'Spring', 'Summer', 'Fall', 'Winter'])
-    if musim != 'Semua':
-        filtered_day_df = filtered_day_df[filtered_day_df['season'] == musim]
-        filtered_hour_df = filtered_hour_df[filtered_hour_df['season'] == musim]
+    musim = st.selectbox(filter_labels['musim'], filter_options['musim'])
     
     # Filter tipe hari
-    tipe_hari = st.selectbox("Pilih Tipe Hari", ['Semua', 'Hari Kerja', 'Akhir Pekan'])
-    if tipe_hari != 'Semua':
-        filtered_day_df = filtered_day_df[filtered_day_df['day_category'] == tipe_hari]
-        filtered_hour_df = filtered_hour_df[filtered_hour_df['day_category'] == tipe_hari]
+    tipe_hari = st.selectbox(filter_labels['tipe_hari'], filter_options['tipe_hari'])
     
     # Filter cuaca
-    cuaca = st.selectbox("Pilih Cuaca", ['Semua', 'Cerah', 'Berkabut', 'Hujan/Salju Ringan', 'Hujan/Salju Lebat'])
-    if cuaca != 'Semua':
-        filtered_day_df = filtered_day_df[filtered_day_df['weather_situation'] == cuaca]
-        filtered_hour_df = filtered_hour_df[filtered_hour_df['weather_situation'] == cuaca]
+    cuaca = st.selectbox(filter_labels['cuaca'], filter_options['cuaca'])
     
     # Filter bulan
-    bulan_options = ['Semua'] + sorted(day_df['month'].unique().tolist())
-    bulan = st.selectbox("Pilih Bulan", bulan_options)
-    if bulan != 'Semua':
-        filtered_day_df = filtered_day_df[filtered_day_df['month'] == bulan]
-        filtered_hour_df = filtered_hour_df[filtered_hour_df['month'] == bulan]
+    bulan = st.selectbox(filter_labels['bulan'], filter_options['bulan'])
     
     # Tombol untuk mereset filter
     if st.button("Reset Filter"):
@@ -213,8 +147,49 @@ with st.sidebar:
         tipe_hari = 'Semua'
         cuaca = 'Semua'
         bulan = 'Semua'
-        filtered_day_df = day_df
-        filtered_hour_df = hour_df
+
+    sidebar_filters = dict(tahun=tahun, musim=musim, tipe_hari=tipe_hari, cuaca=cuaca, bulan=bulan)
+    filtered_day_df, filtered_hour_df = data_processing.filter_data(day_df, hour_df, **sidebar_filters)
+    
+    # Filter per kolom data untuk penyimpanan statistik cukup dan sketsa kuantil
+    active_filters = data_processing.column_filters(**sidebar_filters)
+    
+    # Mode perbandingan beberapa segmen filter secara berdampingan
+    st.markdown("---")
+    mode_perbandingan = st.checkbox("Mode Perbandingan Segmen")
+
+# Footer dan laporan profil startup, dipakai juga oleh mode perbandingan
+def render_footer():
+    """
+    Fungsi untuk menampilkan footer dan laporan profil startup.
+    """
+    st.markdown("""
+    <div class="footer">
+        <p>📊 <strong>Dashboard Penyewaan Sepeda</strong> &copy; 2025</p>
+        <p>Created with ❤️ using Streamlit</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Laporan profil startup
+    profiler.mark("total")
+    if os.environ.get("DASHBOARD_PROFILE_STARTUP") == "1":
+        startup_report = profiler.report()
+        with st.sidebar.expander("⏱️ Profil Startup", expanded=not startup_report["first_paint_within_budget"]):
+            st.write(f"**{'Cold start' if startup_report['cold_start'] else 'Rerun'}**")
+            st.metric("Waktu Impor", f"{startup_report['import_ms']:,.0f} ms",
+                      f"anggaran {startup_report['import_budget_ms']:,.0f} ms", delta_color="off")
+            if startup_report["first_paint_ms"] is not None:
+                st.metric("First Paint", f"{startup_report['first_paint_ms']:,.0f} ms",
+                          f"anggaran {startup_report['first_paint_budget_ms']:,.0f} ms", delta_color="off")
+            st.metric("Total Eksekusi", f"{startup_report['marks']['total']:,.0f} ms")
+            st.dataframe(pd.DataFrame({
+                'Modul': list(startup_report['imports'].keys()),
+                'Waktu Impor (ms)': list(startup_report['imports'].values())
+            }), hide_index=True)
+            if not startup_report["import_within_budget"]:
+                st.warning("Waktu impor melebihi anggaran.")
+            if not startup_report["first_paint_within_budget"]:
+                st.warning("First paint melebihi anggaran.")
 
 # Judul utama dashboard
 st.markdown('<div class="main-header">🚲 Dashboard Penyewaan Sepeda</div>', unsafe_allow_html=True)
@@ -224,6 +199,119 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+# Mode perbandingan: beberapa segmen filter dihitung sekaligus dari sel agregat
+if mode_perbandingan:
+    st.markdown('<div class="sub-header">🔀 Perbandingan Segmen</div>', unsafe_allow_html=True)
+    jumlah_segmen = st.slider("Jumlah Segmen", min_value=2, max_value=4, value=2)
+    
+    # Segmen pertama mengikuti filter sidebar, segmen lainnya dipilih di sini
+    segments = []
+    for i, col in enumerate(st.columns(jumlah_segmen)):
+        with col:
+            st.markdown(f"**Segmen {i + 1}**")
+            segment = {}
+            for name, options in filter_options.items():
+                default = sidebar_filters[name] if i == 0 else 'Semua'
+                segment[name] = st.selectbox(filter_labels[name], options, index=options.index(default),
+                                             key=f"segmen_{i}_{name}")
+            segments.append(segment)
+    
+    day_cells, hour_cells = get_segment_cells(day_df, hour_df)
+    comparison = data_processing.compare_segments(day_cells, hour_cells, segments)
+    segment_colors = ['#1E88E5', '#FFC107', '#43A047', '#E53935']
+    base = comparison[0]
+    
+    # Fungsi untuk menghitung selisih persentase terhadap segmen pertama
+    def delta_pct(value, base_value):
+        if not base_value or np.isnan(base_value) or np.isnan(value):
+            return None
+        return f"{(value - base_value) / base_value:+.1%}"
+    
+    # Metrik utama per segmen dengan selisih terhadap segmen pertama
+    st.write("##### Metrik Utama:")
+    for i, (col, result) in enumerate(zip(st.columns(len(comparison)), comparison)):
+        kpis = result['kpis']
+        with col:
+            st.markdown(f"**{result['label']}**")
+            st.metric("Total Penyewaan", f"{kpis['total_rentals']:,}",
+                      delta_pct(kpis['total_rentals'], base['kpis']['total_rentals']) if i > 0 else None)
+            st.metric("Rata-rata per Hari", f"{kpis['daily_avg']:,.0f}",
+                      delta_pct(kpis['daily_avg'], base['kpis']['daily_avg']) if i > 0 else None)
+            if kpis['max_day'] is not None:
+                st.metric("Penyewaan Tertinggi", f"{kpis['max_day']['total_rentals']:,}",
+                          f"{kpis['max_day']['date'].strftime('%d %b %Y')}", delta_color="off")
+                st.metric("Penyewaan Terendah", f"{kpis['min_day']['total_rentals']:,}",
+                          f"{kpis['min_day']['date'].strftime('%d %b %Y')}", delta_color="off")
+            else:
+                st.metric("Penyewaan Tertinggi", "Tidak ada data")
+                st.metric("Penyewaan Terendah", "Tidak ada data")
+    
+    profiler.mark("first_paint")
+    
+    # Tren penyewaan per jam untuk semua segmen
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for result, color in zip(comparison, segment_colors):
+        ax.plot(result['hourly']['hour'], result['hourly']['total_rentals'], marker='o', linewidth=2,
+                color=color, label=result['label'])
+    ax.set_xlabel("Jam", fontsize=12)
+    ax.set_ylabel("Jumlah Penyewaan", fontsize=12)
+    ax.set_title("Perbandingan Tren Penyewaan Sepanjang Hari", fontsize=14)
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+    
+    st.pyplot(fig)
+    
+    # Heatmap jam x hari per segmen dengan skala warna yang sama
+    st.write("##### Pola Penyewaan Berdasarkan Jam dan Hari:")
+    heatmap_max = np.nanmax([result['heatmap'].max().max() for result in comparison] + [0])
+    for col, result in zip(st.columns(len(comparison)), comparison):
+        with col:
+            if result['heatmap'].empty:
+                st.info(f"Tidak ada data untuk {result['label']}")
+                continue
+            fig, ax = plt.subplots(figsize=(6, 8))
+            sns.heatmap(result['heatmap'], cmap='viridis', vmin=0, vmax=heatmap_max, ax=ax,
+                        cbar_kws={'label': 'Rata-rata Penyewaan'})
+            ax.set_title(result['label'], fontsize=12)
+            ax.set_xlabel('Hari', fontsize=10)
+            ax.set_ylabel('Jam', fontsize=10)
+            
+            st.pyplot(fig)
+    
+    # Rata-rata penyewaan per hari dalam seminggu untuk semua segmen
+    fig, ax = plt.subplots(figsize=(12, 6))
+    bar_width = 0.8 / len(comparison)
+    positions = np.arange(len(data_processing.WEEKDAY_ORDER))
+    for i, (result, color) in enumerate(zip(comparison, segment_colors)):
+        ax.bar(positions + i * bar_width, result['weekday'].fillna(0).to_numpy(), width=bar_width,
+               color=color, label=result['label'])
+    ax.set_xticks(positions + bar_width * (len(comparison) - 1) / 2)
+    ax.set_xticklabels(data_processing.WEEKDAY_ORDER)
+    ax.set_title('Perbandingan Rata-rata Penyewaan Berdasarkan Hari dalam Seminggu', fontsize=14)
+    ax.set_xlabel('Hari', fontsize=12)
+    ax.set_ylabel('Rata-rata Penyewaan', fontsize=12)
+    ax.grid(axis='y', alpha=0.3)
+    ax.legend()
+    
+    st.pyplot(fig)
+    
+    # Ringkasan selisih terhadap segmen pertama
+    insight_lines = []
+    for result in comparison[1:]:
+        delta = delta_pct(result['kpis']['daily_avg'], base['kpis']['daily_avg'])
+        if delta is not None:
+            insight_lines.append(f"<p>Rata-rata penyewaan harian <strong>{result['label']}</strong> berbeda <strong>{delta}</strong> dibandingkan <strong>{base['label']}</strong>.</p>")
+    if insight_lines:
+        st.markdown(f"""
+        <div class="highlight">
+            <p>🔀 <strong>Insight:</strong></p>
+            {''.join(insight_lines)}
+        </div>
+        """, unsafe_allow_html=True)
+    
+    render_footer()
+    st.stop()
+
 # Menampilkan periode data yang difilter
 min_date = filtered_day_df['dteday'].min().strftime('%d %B %Y')
 max_date = filtered_day_df['dteday'].max().strftime('%d %B %Y')
@@ -232,39 +320,42 @@ st.markdown(f"**Periode Data:** {min_date} - {max_date}")
 # Metrik utama dalam kartu
 st.markdown('<div class="sub-header">📊 Metrik Utama</div>', unsafe_allow_html=True)
 col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+kpis = data_processing.compute_kpis(filtered_day_df)
 
 with col1:
     st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-    total_rentals = filtered_day_df['total_rentals'].sum()
+    total_rentals = kpis['total_rentals']
     st.metric("Total Penyewaan", f"{total_rentals:,}")
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col2:
     st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-    daily_avg = filtered_day_df['total_rentals'].mean()
+    daily_avg = kpis['daily_avg']
     st.metric("Rata-rata per Hari", f"{daily_avg:,.0f}")
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col3:
     st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-    if not filtered_day_df.empty:
-        max_day = filtered_day_df.loc[filtered_day_df['total_rentals'].idxmax()]
-        st.metric("Penyewaan Tertinggi", f"{int(max_day['total_rentals']):,}", 
-                  f"{max_day['dteday'].strftime('%d %b %Y')}")
+    if kpis['max_day'] is not None:
+        max_day = kpis['max_day']
+        st.metric("Penyewaan Tertinggi", f"{max_day['total_rentals']:,}", 
+                  f"{max_day['date'].strftime('%d %b %Y')}")
     else:
         st.metric("Penyewaan Tertinggi", "Tidak ada data")
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col4:
     st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-    if not filtered_day_df.empty:
-        min_day = filtered_day_df.loc[filtered_day_df['total_rentals'].idxmin()]
-        st.metric("Penyewaan Terendah", f"{int(min_day['total_rentals']):,}", 
-                  f"{min_day['dteday'].strftime('%d %b %Y')}")
+    if kpis['min_day'] is not None:
+        min_day = kpis['min_day']
+        st.metric("Penyewaan Terendah", f"{min_day['total_rentals']:,}", 
+                  f"{min_day['date'].strftime('%d %b %Y')}")
     else:
         st.metric("Penyewaan Terendah", "Tidak ada data")
     st.markdown('</div>', unsafe_allow_html=True)
 
+profiler.mark("first_paint")
+
 # Tampilkan proporsi pengguna terdaftar vs casual
 st.markdown('<div class="sub-header">👥 Proporsi Pengguna</div>', unsafe_allow_html=True)
 if not filtered_day_df.empty:
@@ -293,7 +384,7 @@ if not filtered_day_df.empty:
 # Grafik penyewaan berdasarkan jam
 st.markdown('<div class="sub-header">⏰ Jumlah Penyewaan Berdasarkan Jam</div>', unsafe_allow_html=True)
 if not filtered_hour_df.empty:
-    hourly_count = filtered_hour_df.groupby('hour')['total_rentals'].sum().reset_index()
+    hourly_count = data_processing.hourly_rentals(filtered_hour_df)
     
     fig, ax = plt.subplots(figsize=(12, 6))
     sns.lineplot(x='hour', y='total_rentals', data=hourly_count, ax=ax, 
@@ -322,6 +413,63 @@ if not filtered_hour_df.empty:
     </div>
     """, unsafe_allow_html=True)
 
+# Distribusi penyewaan per jam dan cuaca dari sketsa kuantil
+st.markdown('<div class="sub-header">📦 Distribusi Penyewaan per Jam dan Cuaca</div>', unsafe_allow_html=True)
+if not filtered_hour_df.empty:
+    hourly_sketches = quantile_store.merged(by='hour', **active_filters)
+    weather_sketches = quantile_store.merged(by='weather_situation', **active_filters)
+    
+    # Box plot per jam (whisker persentil 5-95) dengan garis p90 dan p99
+    hourly_quantiles = quantile_table(hourly_sketches, 'hour')
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.bxp([box_stats(sketch, hour) for hour, sketch in hourly_sketches.items()],
+           positions=list(hourly_sketches.keys()), showfliers=False,
+           boxprops={'color': '#1E88E5'}, medianprops={'color': '#E53935', 'linewidth': 2})
+    ax.plot(hourly_quantiles['hour'], hourly_quantiles['p90'], color='#FFC107', linestyle='--', marker='o', label='p90')
+    ax.plot(hourly_quantiles['hour'], hourly_quantiles['p99'], color='#8E24AA', linestyle=':', marker='o', label='p99')
+    ax.set_title('Distribusi Penyewaan per Jam', fontsize=14)
+    ax.set_xlabel('Jam', fontsize=12)
+    ax.set_ylabel('Jumlah Penyewaan', fontsize=12)
+    ax.grid(axis='y', alpha=0.3)
+    ax.legend()
+    
+    st.pyplot(fig)
+    
+    col1, col2 = st.columns([3, 2])
+    
+    with col1:
+        # Violin plot per kondisi cuaca
+        fig, ax = plt.subplots(figsize=(10, 6))
+        weather_labels = list(weather_sketches.keys())
+        ax.violin([violin_stats(sketch) for sketch in weather_sketches.values()],
+                  positions=range(len(weather_labels)), showmedians=True)
+        ax.set_xticks(range(len(weather_labels)))
+        ax.set_xticklabels(weather_labels)
+        ax.set_title('Distribusi Penyewaan per Jam Berdasarkan Cuaca', fontsize=14)
+        ax.set_xlabel('Kondisi Cuaca', fontsize=12)
+        ax.set_ylabel('Jumlah Penyewaan', fontsize=12)
+        ax.grid(axis='y', alpha=0.3)
+        
+        st.pyplot(fig)
+    
+    with col2:
+        st.write("##### Kuantil Permintaan per Cuaca:")
+        weather_quantiles = quantile_table(weather_sketches, 'weather_situation')
+        st.dataframe(weather_quantiles.rename(columns={'weather_situation': 'Cuaca', 'count': 'Jumlah Jam'}),
+                     use_container_width=True, hide_index=True)
+    
+    st.write("##### Kuantil Permintaan per Jam:")
+    st.dataframe(hourly_quantiles.rename(columns={'hour': 'Jam', 'count': 'Jumlah Data'}),
+                 use_container_width=True, hide_index=True)
+    
+    # Jam dengan permintaan p99 tertinggi untuk perencanaan kapasitas
+    peak_hour = hourly_quantiles.loc[hourly_quantiles['p99'].idxmax()]
+    st.markdown(f"""
+    <div class="highlight">
+        <p>📦 <strong>Insight:</strong> Untuk perencanaan kapasitas, jam dengan permintaan p99 tertinggi adalah pukul <strong>{int(peak_hour["hour"])}:00</strong> dengan <strong>{int(peak_hour["p99"]):,}</strong> penyewaan (median {int(peak_hour["p50"]):,}).</p>
+    </div>
+    """, unsafe_allow_html=True)
+
 # Perbandingan hari kerja vs akhir pekan
 st.markdown('<div class="sub-header">📌 Perbandingan Penyewaan: Hari Kerja vs Akhir Pekan</div>', unsafe_allow_html=True)
 if not filtered_day_df.empty:
@@ -393,15 +541,8 @@ if not filtered_day_df.empty:
 # Analisis berdasarkan musim
 st.markdown('<div class="sub-header">🍂 Penyewaan Berdasarkan Musim</div>', unsafe_allow_html=True)
 if not filtered_day_df.empty:
-    # Mengelompokkan data berdasarkan musim
-    season_rentals = filtered_day_df.groupby('season', observed=False)['total_rentals'].sum().reset_index()
-    
-    # Hitung rata-rata per hari untuk setiap musim
-    season_avg = filtered_day_df.groupby('season').agg(
-        total_rentals=('total_rentals', 'sum'),
-        count=('dteday', 'count')
-    ).reset_index()
-    season_avg['avg_rentals'] = season_avg['total_rentals'] / season_avg['count']
+    # Mengelompokkan data berdasarkan musim (total dan rata-rata per hari)
+    season_rentals, season_avg = data_processing.season_rentals(filtered_day_df)
     
     # Visualisasi
     fig, axes = plt.subplots(1, 2, figsize=(16, 6))
@@ -449,8 +590,7 @@ if not filtered_day_df.empty:
 st.markdown('<div class="sub-header">🌤️ Pengaruh Cuaca Terhadap Penyewaan</div>', unsafe_allow_html=True)
 if not filtered_day_df.empty:
     # Mengelompokkan data berdasarkan situasi cuaca
-    weather_rentals = filtered_day_df.groupby('weather_situation')['total_rentals'].mean().reset_index()
-    weather_rentals = weather_rentals.sort_values('total_rentals', ascending=False)
+    weather_rentals = data_processing.weather_rentals(filtered_day_df)
     
     # Visualisasi
     fig, ax = plt.subplots(figsize=(10, 6))
@@ -533,6 +673,14 @@ if not filtered_day_df.empty:
     if ma_window > 1:
         daily_rentals['moving_avg'] = daily_rentals['total_rentals'].rolling(window=ma_window).mean()
         ax.plot(daily_rentals['dteday'], daily_rentals['moving_avg'], color='red', linewidth=2, linestyle='--', label=f'Rata-rata Bergerak ({ma_window} hari)')
+    
+    # Tandai hari-hari anomali pada grafik tren
+    daily_anomalies = daily_detector.anomalies()
+    daily_anomalies = daily_anomalies[daily_anomalies['timestamp'].isin(daily_rentals['dteday'])]
+    if not daily_anomalies.empty:
+        ax.scatter(daily_anomalies['timestamp'], daily_anomalies['value'], color='#E53935',
+                   s=60, zorder=5, label='Anomali')
+    if ma_window > 1 or not daily_anomalies.empty:
         ax.legend()
     
     # Format sumbu x untuk mengurangi kesesakan
@@ -554,11 +702,69 @@ if not filtered_day_df.empty:
         </div>
         """, unsafe_allow_html=True)
 
+# Deteksi anomali penyewaan per jam
+st.markdown('<div class="sub-header">🚨 Deteksi Anomali Penyewaan</div>', unsafe_allow_html=True)
+if not filtered_hour_df.empty:
+    # Deret waktu per jam sesuai filter
+    hourly_timestamps, _, hourly_values = hourly_detector_input(filtered_hour_df)
+    hourly_series = pd.DataFrame({'timestamp': hourly_timestamps, 'total_rentals': hourly_values}).sort_values('timestamp')
+    
+    # Ambil anomali dalam rentang waktu data yang difilter, lalu batasi ke jam yang terpilih
+    period_start, period_end = hourly_series['timestamp'].min(), hourly_series['timestamp'].max()
+    hourly_anomalies = hourly_detector.anomalies(start=period_start, end=period_end)
+    hourly_anomalies = hourly_anomalies[hourly_anomalies['timestamp'].isin(hourly_series['timestamp'])]
+    
+    # Visualisasi deret waktu per jam dengan penanda anomali
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(hourly_series['timestamp'], hourly_series['total_rentals'], linewidth=0.5, color='#1E88E5', alpha=0.7)
+    for kind, color in [('Lonjakan', '#E53935'), ('Penurunan', '#8E24AA')]:
+        kind_anomalies = hourly_anomalies[hourly_anomalies['type'] == kind]
+        if not kind_anomalies.empty:
+            ax.scatter(kind_anomalies['timestamp'], kind_anomalies['value'], color=color, s=25, zorder=5, label=kind)
+    ax.set_title('Anomali Penyewaan per Jam (Baseline Jam dalam Seminggu)', fontsize=14)
+    ax.set_xlabel('Waktu', fontsize=12)
+    ax.set_ylabel('Jumlah Penyewaan', fontsize=12)
+    ax.grid(True, alpha=0.3)
+    if not hourly_anomalies.empty:
+        ax.legend()
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    
+    st.pyplot(fig)
+    
+    # Daftar anomali yang dapat dikueri
+    col1, col2 = st.columns(2)
+    with col1:
+        jenis_anomali = st.selectbox("Jenis Anomali", ['Semua', 'Lonjakan', 'Penurunan'])
+    with col2:
+        skor_minimum = st.slider("Skor Minimum (|z|)", min_value=float(hourly_detector.threshold),
+                                 max_value=15.0, value=float(hourly_detector.threshold), step=0.5)
+    
+    anomaly_table = hourly_detector.anomalies(start=period_start, end=period_end, min_score=skor_minimum,
+                                              kind=None if jenis_anomali == 'Semua' else jenis_anomali)
+    anomaly_table = anomaly_table[anomaly_table['timestamp'].isin(hourly_series['timestamp'])]
+    anomaly_table = anomaly_table.sort_values('score', key=abs, ascending=False)
+    
+    st.write(f"##### Daftar Anomali ({len(anomaly_table):,} data):")
+    st.dataframe(anomaly_table.rename(columns={
+        'timestamp': 'Waktu',
+        'value': 'Penyewaan',
+        'expected': 'Baseline',
+        'score': 'Skor z',
+        'type': 'Jenis'
+    }).drop(columns=['slot']), use_container_width=True, hide_index=True)
+    
+    st.markdown(f"""
+    <div class="highlight">
+        <p>🚨 <strong>Insight:</strong> Terdeteksi <strong>{len(hourly_anomalies):,}</strong> jam dengan penyewaan tidak wajar dibandingkan baseline jam yang sama pada minggu-minggu sebelumnya ({(hourly_anomalies['type'] == 'Lonjakan').sum():,} lonjakan, {(hourly_anomalies['type'] == 'Penurunan').sum():,} penurunan).</p>
+    </div>
+    """, unsafe_allow_html=True)
+
 # Analisis berdasarkan hari dalam seminggu
 st.markdown('<div class="sub-header">📆 Penyewaan Berdasarkan Hari dalam Seminggu</div>', unsafe_allow_html=True)
 if not filtered_day_df.empty:
     # Mengelompokkan data berdasarkan hari dalam seminggu
-    weekday_order = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
+    weekday_order = data_processing.WEEKDAY_ORDER
     weekday_rentals = filtered_day_df.groupby('day_of_week')['total_rentals'].mean().reset_index()
     
     # Mengkonversi DataFrame ke format yang diinginkan dengan urutan hari yang benar
@@ -598,12 +804,7 @@ if not filtered_day_df.empty:
 st.markdown('<div class="sub-header">🕒 Pola Penyewaan Berdasarkan Jam dan Hari</div>', unsafe_allow_html=True)
 if not filtered_hour_df.empty:
     # Membuat pivot table untuk pola penyewaan berdasarkan jam dan hari
-    heatmap_data = filtered_hour_df.pivot_table(observed=False,
-        index='hour', 
-        columns='day_of_week', 
-        values='total_rentals', 
-        aggfunc='mean'
-    ).reindex(columns=weekday_order)
+    heatmap_data = data_processing.hour_weekday_heatmap(filtered_hour_df)
     
     # Visualisasi heatmap
     fig, ax = plt.subplots(figsize=(12, 8))
@@ -636,9 +837,15 @@ if not filtered_day_df.empty:
     fig, ax = plt.subplots(figsize=(10, 6))
     sns.scatterplot(x='temperature_celsius', y='total_rentals', data=filtered_day_df, alpha=0.6, hue='season', ax=ax)
     
-    # Tambahkan garis trend (regresi)
-    sns.regplot(x='temperature_celsius', y='total_rentals', data=filtered_day_df, 
-                scatter=False, ax=ax, line_kws={"color": "red", "alpha": 0.7, "lw": 2})
+    # Statistik untuk filter yang dipilih, diambil dari statistik cukup per sel
+    correlation_matrix = stats_store.correlation_matrix(**active_filters)
+    column_means = stats_store.means(**active_filters)
+    
+    # Tambahkan garis trend (regresi), kemiringan dikonversi ke satuan °C
+    slope = stats_store.regression_slope('temperature', 'total_rentals', **active_filters) / 41
+    intercept = column_means['total_rentals'] - slope * column_means['temperature'] * 41
+    temp_range = np.array([filtered_day_df['temperature_celsius'].min(), filtered_day_df['temperature_celsius'].max()])
+    ax.plot(temp_range, intercept + slope * temp_range, color='red', alpha=0.7, lw=2)
     
     ax.set_title('Hubungan Antara Suhu dan Jumlah Penyewaan', fontsize=14)
     ax.set_xlabel('Suhu (°C)', fontsize=12)
@@ -646,7 +853,7 @@ if not filtered_day_df.empty:
     ax.grid(True, alpha=0.3)
     
     # Hitung korelasi
-    correlation = filtered_day_df['temperature_celsius'].corr(filtered_day_df['total_rentals'])
+    correlation = correlation_matrix.loc['temperature', 'total_rentals']
     
     st.pyplot(fig)
     
@@ -670,6 +877,25 @@ if not filtered_day_df.empty:
         <p>Hal ini menunjukkan bahwa {"semakin tinggi suhu, semakin banyak penyewaan sepeda" if correlation > 0 else "semakin rendah suhu, semakin banyak penyewaan sepeda"}.</p>
     </div>
     """, unsafe_allow_html=True)
+    
+    # Matriks korelasi lengkap untuk variabel cuaca dan penggunaan
+    st.write("##### Matriks Korelasi Variabel Cuaca dan Penggunaan:")
+    correlation_labels = {
+        'temperature': 'Suhu',
+        'atemp': 'Suhu Terasa',
+        'humidity': 'Kelembaban',
+        'wind_speed': 'Kecepatan Angin',
+        'casual_users': 'Pengguna Casual',
+        'registered_users': 'Pengguna Terdaftar',
+        'total_rentals': 'Total Penyewaan'
+    }
+    fig, ax = plt.subplots(figsize=(10, 8))
+    sns.heatmap(correlation_matrix.rename(index=correlation_labels, columns=correlation_labels),
+                cmap='coolwarm', vmin=-1, vmax=1, annot=True, fmt='.2f', ax=ax,
+                cbar_kws={'label': 'Koefisien Korelasi'})
+    ax.set_title('Korelasi Antar Variabel', fontsize=14)
+    
+    st.pyplot(fig)
 
 # Analisis perbandingan tahun
 if 'year' in filtered_day_df.columns and len(filtered_day_df['year'].unique()) > 1:
@@ -708,53 +934,6 @@ if 'year' in filtered_day_df.columns and len(filtered_day_df['year'].unique()) >
 # Kesimpulan dan Rekomendasi
 st.markdown('<div class="sub-header">🎯 Kesimpulan dan Rekomendasi</div>', unsafe_allow_html=True)
 
-# Buat kesimpulan berdasarkan data yang telah dianalisis
-import streamlit as st
-
-import streamlit as st
-
-# Tambahkan CSS ke dalam Streamlit
-st.markdown("""
-    <style>
-        /* Gaya untuk kotak highlight */
-        .highlight {
-            background-color: #f9f9f9;
-            color: #555;
-            padding: 20px;
-            border-radius: 10px;
-            border-left: 5px solid #4CAF50;
-            margin-bottom: 20px;
-        }
-
-        /* Gaya untuk judul kecil */
-        h4 {
-            color: #333;
-            text-align: center;
-        }
-
-        /* Gaya untuk daftar */
-        ol {
-            padding-left: 20px;
-        }
-
-        /* Gaya untuk footer */
-        .footer {
-            text-align: center;
-            margin-top: 40px;
-            padding: 20px;
-            border-top: 2px solid #ccc;
-            background-color: #f9f9f9;
-            border-radius: 10px;
-        }
-
-        .footer p {
-            margin: 5px;
-            font-size: 14px;
-            color: #555;
-        }
-    </style>
-""", unsafe_allow_html=True)
-
 # Gunakan class CSS di dalam HTML
 st.markdown("""
 <div class="highlight">
@@ -777,10 +956,4 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Footer
-st.markdown("""
-<div class="footer">
-    <p>📊 <strong>Dashboard Penyewaan Sepeda</strong> &copy; 2025</p>
-    <p>Created with ❤️ using Streamlit</p>
-</div>
-""", unsafe_allow_html=True)
+render_footer()
@@ -0,0 +1,321 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Folder data bawaan dashboard
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+WEEKDAY_ORDER = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
+
+# Pilihan filter di sidebar, dipakai bersama oleh dashboard dan layanan query
+FILTER_OPTIONS = {
+    'tahun': ['Semua', '2011', '2012'],
+    'musim': ['Semua', 'Spring', 'Summer', 'Fall', 'Winter'],
+    'tipe_hari': ['Semua', 'Hari Kerja', 'Akhir Pekan'],
+    'cuaca': ['Semua', 'Cerah', 'Berkabut', 'Hujan/Salju Ringan', 'Hujan/Salju Lebat'],
+    'bulan': ['Semua', 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+              'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+}
+
+# Pemetaan nama filter di sidebar ke kolom data
+FILTER_COLUMNS = {
+    'tahun': 'year',
+    'musim': 'season',
+    'tipe_hari': 'day_category',
+    'cuaca': 'weather_situation',
+    'bulan': 'month'
+}
+
+# Kolom data dimensi filter, dengan urutan yang sama seperti FILTER_OPTIONS
+FILTER_KEYS = [FILTER_COLUMNS[name] for name in FILTER_OPTIONS]
+
+
+def load_data(base_path=DATA_DIR):
+    """
+    Fungsi untuk memuat dan mempersiapkan data.
+    """
+    # Baca data dari file CSV
+    day_df = pd.read_csv(os.path.join(base_path, "day_df.csv"))
+    hour_df = pd.read_csv(os.path.join(base_path, "hour_df.csv"))
+    
+    # Hapus kolom yang tidak diperlukan
+    for df in [day_df, hour_df]:
+        df.drop(['workingday'], axis=1, inplace=True)
+    
+    # Ubah tipe data kolom kategori
+    kategori_kolom = ['season', 'mnth', 'holiday', 'weekday', 'weathersit']
+    for df in [day_df, hour_df]:
+        for col in kategori_kolom:
+            df[col] = df[col].astype("category")
+    
+    # Konversi kolom tanggal ke tipe datetime
+    for df in [day_df, hour_df]:
+        df['dteday'] = pd.to_datetime(df['dteday'])
+    
+    # Ganti nama kolom untuk meningkatkan keterbacaan
+    rename_dict = {
+        'yr': 'year',
+        'mnth': 'month',
+        'weekday': 'day_of_week',
+        'weathersit': 'weather_situation',
+        'windspeed': 'wind_speed',
+        'cnt': 'total_rentals',
+        'hum': 'humidity',
+        'temp': 'temperature',
+        'casual': 'casual_users',
+        'registered': 'registered_users'
+    }
+    day_df.rename(columns=rename_dict, inplace=True)
+    hour_df.rename(columns={**rename_dict, 'hr': 'hour'}, inplace=True)
+    
+    # Buat pemetaan untuk nilai kategori
+    mapping_dict = {
+        'season': {1: 'Spring', 2: 'Summer', 3: 'Fall', 4: 'Winter'},
+        'month': {i: month for i, month in enumerate(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                                                       'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'], 1)},
+        'weather_situation': {1: 'Cerah', 2: 'Berkabut', 3: 'Hujan/Salju Ringan', 4: 'Hujan/Salju Lebat'},
+        'day_of_week': {0: 'Minggu', 1: 'Senin', 2: 'Selasa', 3: 'Rabu',
+                        4: 'Kamis', 5: 'Jumat', 6: 'Sabtu'},
+        'year': {0: '2011', 1: '2012'},
+        'holiday': {0: 'Hari Biasa', 1: 'Hari Libur'}
+    }
+    
+    # Terapkan pemetaan ke data
+    for col, mapping in mapping_dict.items():
+        # Pastikan kolom bertipe kategori
+        if col in day_df.columns:
+            if not isinstance(day_df[col].dtype, pd.CategoricalDtype):
+                day_df[col] = day_df[col].astype("category")
+            day_df[col] = day_df[col].cat.rename_categories(mapping)
+
+        if col in hour_df.columns:
+            if not isinstance(hour_df[col].dtype, pd.CategoricalDtype):
+                hour_df[col] = hour_df[col].astype("category")
+            hour_df[col] = hour_df[col].cat.rename_categories(mapping)
+
+
+    
+    # Fungsi untuk mengkategorikan hari (Weekday/Weekend)
+    def categorize_day(day):
+        return "Akhir Pekan" if day in ["Sabtu", "Minggu"] else "Hari Kerja"
+    
+    # Terapkan kategorisasi hari
+    for df in [day_df, hour_df]:
+        df["day_category"] = df["day_of_week"].apply(categorize_day)
+    
+    # Fungsi untuk mengkategorikan kelembaban
+    def categorize_humidity(hum):
+        if hum < 45:
+            return "Kering"
+        elif hum < 65:
+            return "Ideal"
+        else:
+            return "Lembab"
+    
+    # Terapkan kategorisasi kelembaban
+    for df in [day_df, hour_df]:
+        df["humidity_category"] = df["humidity"].apply(categorize_humidity)
+    
+    # Fungsi untuk mengkategorikan suhu
+    def categorize_temperature(temp):
+        # Mengkonversi suhu normalisasi ke Celsius (temp * 41)
+        temp_celsius = temp * 41
+        if temp_celsius < 15:
+            return "Dingin"
+        elif temp_celsius < 25:
+            return "Nyaman"
+        else:
+            return "Panas"
+    
+    # Terapkan kategorisasi suhu
+    for df in [day_df, hour_df]:
+        df["temperature_category"] = df["temperature"].apply(categorize_temperature)
+        # Menambahkan kolom suhu dalam Celsius untuk visualisasi yang lebih jelas
+        df["temperature_celsius"] = df["temperature"] * 41
+    
+    return day_df, hour_df
+
+
+def column_filters(**filters):
+    """
+    Fungsi untuk mengubah pilihan filter sidebar (tahun, musim, ...) menjadi filter per kolom data.
+    """
+    return {FILTER_COLUMNS[name]: value for name, value in filters.items()}
+
+
+def filter_data(day_df, hour_df, tahun='Semua', musim='Semua', tipe_hari='Semua', cuaca='Semua', bulan='Semua'):
+    """
+    Fungsi untuk memfilter data harian dan per jam sesuai pilihan filter di sidebar.
+    Nilai 'Semua' berarti tidak difilter.
+    """
+    filters = dict(tahun=tahun, musim=musim, tipe_hari=tipe_hari, cuaca=cuaca, bulan=bulan)
+    filtered_day_df = day_df
+    filtered_hour_df = hour_df
+    for name, value in filters.items():
+        if value != 'Semua':
+            col = FILTER_COLUMNS[name]
+            filtered_day_df = filtered_day_df[filtered_day_df[col] == value]
+            filtered_hour_df = filtered_hour_df[filtered_hour_df[col] == value]
+    return filtered_day_df, filtered_hour_df
+
+
+def compute_kpis(filtered_day_df):
+    """
+    Fungsi untuk menghitung metrik utama: total, rata-rata harian, serta hari tertinggi dan terendah.
+    """
+    if filtered_day_df.empty:
+        return {
+            'total_rentals': 0,
+            'daily_avg': float('nan'),
+            'max_day': None,
+            'min_day': None
+        }
+    max_day = filtered_day_df.loc[filtered_day_df['total_rentals'].idxmax()]
+    min_day = filtered_day_df.loc[filtered_day_df['total_rentals'].idxmin()]
+    return {
+        'total_rentals': int(filtered_day_df['total_rentals'].sum()),
+        'daily_avg': float(filtered_day_df['total_rentals'].mean()),
+        'max_day': {'date': max_day['dteday'], 'total_rentals': int(max_day['total_rentals'])},
+        'min_day': {'date': min_day['dteday'], 'total_rentals': int(min_day['total_rentals'])}
+    }
+
+
+def hourly_rentals(filtered_hour_df):
+    """
+    Fungsi untuk menghitung total penyewaan per jam.
+    """
+    return filtered_hour_df.groupby('hour')['total_rentals'].sum().reset_index()
+
+
+def season_rentals(filtered_day_df):
+    """
+    Fungsi untuk menghitung total dan rata-rata harian penyewaan per musim.
+    """
+    season_total = filtered_day_df.groupby('season', observed=False)['total_rentals'].sum().reset_index()
+    
+    # Hitung rata-rata per hari untuk setiap musim
+    season_avg = filtered_day_df.groupby('season', observed=True).agg(
+        total_rentals=('total_rentals', 'sum'),
+        count=('dteday', 'count')
+    ).reset_index()
+    season_avg['avg_rentals'] = season_avg['total_rentals'] / season_avg['count']
+    return season_total, season_avg
+
+
+def weather_rentals(filtered_day_df):
+    """
+    Fungsi untuk menghitung rata-rata penyewaan per kondisi cuaca, diurutkan dari yang tertinggi.
+    """
+    weather_avg = filtered_day_df.groupby('weather_situation', observed=True)['total_rentals'].mean().reset_index()
+    return weather_avg.sort_values('total_rentals', ascending=False)
+
+
+def hour_weekday_heatmap(filtered_hour_df):
+    """
+    Fungsi untuk membuat grid rata-rata penyewaan berdasarkan jam dan hari dalam seminggu.
+    """
+    return filtered_hour_df.pivot_table(observed=False,
+        index='hour', 
+        columns='day_of_week', 
+        values='total_rentals', 
+        aggfunc='mean'
+    ).reindex(columns=WEEKDAY_ORDER)
+
+
+def build_segment_cells(day_df, hour_df):
+    """
+    Fungsi untuk mengagregasi data sekali ke dalam sel filter (tahun, musim, tipe hari,
+    cuaca, bulan) beserta hari dan jam. Hasil setiap segmen perbandingan disusun dari
+    sel-sel ini tanpa memproses ulang data mentah.
+    """
+    keys = FILTER_KEYS
+    
+    # Sel harian: total, jumlah hari, serta hari tertinggi dan terendah per sel
+    day_cells = day_df.groupby(keys + ['day_of_week'], observed=True).agg(
+        total_rentals=('total_rentals', 'sum'),
+        days=('dteday', 'count'),
+        max_idx=('total_rentals', 'idxmax'),
+        min_idx=('total_rentals', 'idxmin')
+    ).reset_index()
+    for extreme in ['max', 'min']:
+        rows = day_df.loc[day_cells[f'{extreme}_idx']]
+        day_cells[f'{extreme}_rentals'] = rows['total_rentals'].to_numpy()
+        day_cells[f'{extreme}_date'] = rows['dteday'].to_numpy()
+    day_cells = day_cells.drop(columns=['max_idx', 'min_idx'])
+    
+    # Sel per jam: total dan jumlah data per jam dan hari
+    hour_cells = hour_df.groupby(keys + ['hour', 'day_of_week'], observed=True)['total_rentals'].agg(
+        total_rentals='sum',
+        count='count'
+    ).reset_index()
+    
+    # Kolom kategori diubah ke string agar pencocokan filter sederhana
+    for cells in [day_cells, hour_cells]:
+        for col in keys + ['day_of_week']:
+            cells[col] = cells[col].astype(str)
+    return day_cells, hour_cells
+
+
+def segment_label(segment):
+    """
+    Fungsi untuk membuat label segmen dari pilihan filternya.
+    """
+    values = [segment.get(name, 'Semua') for name in FILTER_COLUMNS]
+    values = [value for value in values if value != 'Semua']
+    return ' · '.join(values) if values else 'Semua Data'
+
+
+def _segment_mask(cells, segment):
+    mask = np.ones(len(cells), dtype=bool)
+    for name, col in FILTER_COLUMNS.items():
+        value = segment.get(name, 'Semua')
+        if value != 'Semua':
+            mask &= cells[col].to_numpy() == value
+    return mask
+
+
+def compare_segments(day_cells, hour_cells, segments):
+    """
+    Fungsi untuk menghitung KPI, tren per jam, heatmap jam x hari, dan rata-rata per hari
+    dalam seminggu untuk beberapa segmen filter sekaligus dari sel hasil build_segment_cells.
+    """
+    results = []
+    for segment in segments:
+        segment_days = day_cells[_segment_mask(day_cells, segment)]
+        segment_hours = hour_cells[_segment_mask(hour_cells, segment)]
+        
+        # KPI segmen
+        if segment_days.empty:
+            kpis = compute_kpis(segment_days)
+        else:
+            total_rentals = int(segment_days['total_rentals'].sum())
+            max_cell = segment_days.loc[segment_days['max_rentals'].idxmax()]
+            min_cell = segment_days.loc[segment_days['min_rentals'].idxmin()]
+            kpis = {
+                'total_rentals': total_rentals,
+                'daily_avg': total_rentals / segment_days['days'].sum(),
+                'max_day': {'date': max_cell['max_date'], 'total_rentals': int(max_cell['max_rentals'])},
+                'min_day': {'date': min_cell['min_date'], 'total_rentals': int(min_cell['min_rentals'])}
+            }
+        
+        # Tren penyewaan per jam
+        hourly = segment_hours.groupby('hour')['total_rentals'].sum().reset_index()
+        
+        # Heatmap rata-rata penyewaan berdasarkan jam dan hari
+        heatmap_sums = segment_hours.groupby(['hour', 'day_of_week'])[['total_rentals', 'count']].sum()
+        heatmap = (heatmap_sums['total_rentals'] / heatmap_sums['count']).unstack().reindex(columns=WEEKDAY_ORDER)
+        
+        # Rata-rata penyewaan per hari dalam seminggu
+        weekday_sums = segment_days.groupby('day_of_week')[['total_rentals', 'days']].sum()
+        weekday = (weekday_sums['total_rentals'] / weekday_sums['days']).reindex(WEEKDAY_ORDER)
+        
+        results.append({
+            'label': segment_label(segment),
+            'filters': segment,
+            'kpis': kpis,
+            'hourly': hourly,
+            'heatmap': heatmap,
+            'weekday': weekday
+        })
+    return results
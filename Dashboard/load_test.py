@@ -0,0 +1,119 @@
+"""
+Skrip uji beban untuk layanan query agregat (api.py).
+
+Contoh:
+    python Dashboard/load_test.py --requests 5000 --concurrency 16 --etag
+"""
+import argparse
+import http.client
+import random
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlencode
+
+from data_processing import FILTER_OPTIONS
+
+ENDPOINTS = ['kpis', 'hourly_count', 'season_avg', 'weather_means', 'heatmap', 'correlation', 'summary']
+
+
+def random_path(rng):
+    """
+    Fungsi untuk membuat path request acak dengan kombinasi filter acak.
+    """
+    endpoint = rng.choice(ENDPOINTS)
+    params = {name: rng.choice(options) for name, options in FILTER_OPTIONS.items()
+              if rng.random() < 0.5}
+    query = urlencode(params)
+    return f"/api/{endpoint}" + (f"?{query}" if query else "")
+
+
+def worker(host, port, paths, use_etag, latencies, statuses, lock):
+    # Satu koneksi keep-alive per worker
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    etags = {}
+    local_latencies = []
+    local_statuses = Counter()
+    for path in paths:
+        headers = {}
+        if use_etag and path in etags:
+            headers['If-None-Match'] = etags[path]
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            # Kegagalan dicatat, lalu koneksi dibuka ulang untuk request berikutnya
+            local_statuses['error'] += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        local_latencies.append(time.perf_counter() - start)
+        local_statuses[response.status] += 1
+        etag = response.getheader('ETag')
+        if etag is not None:
+            etags[path] = etag
+    conn.close()
+    with lock:
+        latencies.extend(local_latencies)
+        statuses.update(local_statuses)
+
+
+def percentile(sorted_values, p):
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uji beban layanan query agregat")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--distinct-paths', type=int, default=50,
+                        help="Jumlah kombinasi endpoint/filter berbeda yang dipakai")
+    parser.add_argument('--etag', action='store_true', help="Kirim If-None-Match untuk path yang sudah pernah diminta")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    path_pool = [random_path(rng) for _ in range(args.distinct_paths)]
+    # Sisa pembagian request dibagikan ke worker pertama; worker tanpa request tidak dijalankan
+    base_count, remainder = divmod(args.requests, args.concurrency)
+    per_worker = [[rng.choice(path_pool) for _ in range(base_count + (1 if i < remainder else 0))]
+                  for i in range(args.concurrency)]
+    per_worker = [paths for paths in per_worker if paths]
+
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+    threads = [threading.Thread(target=worker, args=(args.host, args.port, paths, args.etag, latencies, statuses, lock))
+               for paths in per_worker]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total = len(latencies)
+    errors = statuses['error']
+    print(f"Total request : {total + errors:,}")
+    print(f"Berhasil      : {total:,}")
+    print(f"Gagal         : {errors:,}")
+    print(f"Durasi        : {elapsed:.2f} s")
+    if total:
+        print(f"Throughput    : {total / elapsed:,.0f} request/s")
+        print(f"Latensi p50   : {percentile(latencies, 50) * 1000:.1f} ms")
+        print(f"Latensi p95   : {percentile(latencies, 95) * 1000:.1f} ms")
+        print(f"Latensi p99   : {percentile(latencies, 99) * 1000:.1f} ms")
+    print(f"Status        : {dict(sorted(statuses.items(), key=lambda item: str(item[0])))}")
+    if errors:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
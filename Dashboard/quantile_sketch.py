@@ -0,0 +1,221 @@
+import math
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_processing import FILTER_KEYS
+
+
+class KLLSketch:
+    """
+    Sketsa kuantil KLL yang dapat digabung (mergeable).
+    Data disimpan dalam beberapa tingkat compactor; setiap item pada tingkat h
+    mewakili 2**h data asli, sehingga memori tetap kecil berapa pun jumlah datanya.
+    """
+
+    __slots__ = ('k', 'c', 'compactors', 'size', 'max_size', 'count', '_offset')
+
+    def __init__(self, k=200, c=2.0 / 3.0):
+        self.k = k
+        self.c = c
+        self.compactors = []
+        self.size = 0
+        self.max_size = 0
+        self.count = 0
+        self._offset = 0
+        self._grow()
+
+    def _grow(self):
+        self.compactors.append([])
+        self.max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def _capacity(self, height):
+        depth = len(self.compactors) - height - 1
+        return int(math.ceil(self.c ** depth * self.k)) + 1
+
+    def _compress(self):
+        for h in range(len(self.compactors)):
+            if len(self.compactors[h]) >= self._capacity(h):
+                if h + 1 >= len(self.compactors):
+                    self._grow()
+                level = sorted(self.compactors[h])
+                # Sisakan satu item jika jumlahnya ganjil agar bobot tetap tepat
+                leftover = [level.pop()] if len(level) % 2 else []
+                # Offset bergantian menggantikan lemparan koin acak
+                self.compactors[h + 1].extend(level[self._offset::2])
+                self._offset ^= 1
+                self.compactors[h] = leftover
+                self.size = sum(len(level) for level in self.compactors)
+                break
+
+    def update(self, value):
+        """
+        Fungsi untuk menambahkan satu data ke sketsa.
+        """
+        self.compactors[0].append(value)
+        self.size += 1
+        self.count += 1
+        if self.size >= self.max_size:
+            self._compress()
+
+    def merge(self, other):
+        """
+        Fungsi untuk menggabungkan sketsa lain ke dalam sketsa ini.
+        """
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for h, level in enumerate(other.compactors):
+            self.compactors[h].extend(level)
+        self.size = sum(len(level) for level in self.compactors)
+        self.count += other.count
+        while self.size >= self.max_size:
+            self._compress()
+        return self
+
+    def weighted_items(self):
+        """
+        Fungsi untuk mengambil item yang tersimpan beserta bobotnya, terurut menurut nilai.
+        """
+        values = []
+        weights = []
+        for h, level in enumerate(self.compactors):
+            values.extend(level)
+            weights.extend([2 ** h] * len(level))
+        values = np.asarray(values, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        order = np.argsort(values, kind='stable')
+        return values[order], weights[order]
+
+    def quantiles(self, qs):
+        """
+        Fungsi untuk memperkirakan nilai kuantil (0-1) dari sketsa.
+        """
+        values, weights = self.weighted_items()
+        if len(values) == 0:
+            return [np.nan] * len(qs)
+        cumulative = np.cumsum(weights)
+        ranks = np.asarray(qs) * cumulative[-1]
+        index = np.minimum(np.searchsorted(cumulative, ranks, side='left'), len(values) - 1)
+        return values[index].tolist()
+
+
+class QuantileSketchStore:
+    """
+    Penyimpanan sketsa kuantil per jam x sel filter untuk data per jam.
+    Kuantil untuk pilihan filter apa pun dijawab dengan menggabungkan sketsa
+    yang cocok, tanpa mengurutkan data mentah.
+    """
+
+    def __init__(self, value_column='total_rentals', keys=FILTER_KEYS, k=200):
+        self.value_column = value_column
+        self.keys = list(keys)
+        self.k = k
+        self.sketches = {}
+        # Urutan kategori per dimensi, dipakai untuk mengurutkan hasil penggabungan
+        self.category_orders = {}
+        self.last_timestamp = None
+        self._lock = threading.Lock()
+
+    def ingest(self, hour_df):
+        """
+        Fungsi untuk menambahkan data per jam baru ke sketsa.
+        Data dengan waktu <= last_timestamp dilewati sehingga riwayat tidak diproses ulang.
+        """
+        timestamps = hour_df['dteday'] + pd.to_timedelta(hour_df['hour'], unit='h')
+        with self._lock:
+            if self.last_timestamp is not None:
+                mask = (timestamps > self.last_timestamp).to_numpy()
+                hour_df, timestamps = hour_df[mask], timestamps[mask]
+            if hour_df.empty:
+                return 0
+
+            columns = ['hour'] + self.keys
+            for col in self.keys:
+                if isinstance(hour_df[col].dtype, pd.CategoricalDtype):
+                    self.category_orders[col] = [str(value) for value in hour_df[col].cat.categories]
+            cells = zip(*(hour_df[col].astype(str) if col != 'hour' else hour_df[col] for col in columns))
+            for cell, value in zip(cells, hour_df[self.value_column].tolist()):
+                sketch = self.sketches.get(cell)
+                if sketch is None:
+                    sketch = self.sketches[cell] = KLLSketch(self.k)
+                sketch.update(value)
+            self.last_timestamp = timestamps.max()
+            return len(hour_df)
+
+    def merged(self, by='hour', **filters):
+        """
+        Fungsi untuk menggabungkan sketsa yang cocok dengan filter, dikelompokkan
+        berdasarkan 'hour' atau salah satu dimensi filter.
+        Nilai filter None atau 'Semua' berarti tidak difilter.
+        """
+        positions = {col: i for i, col in enumerate(['hour'] + self.keys)}
+        active = {positions[key]: str(value) for key, value in filters.items()
+                  if value is not None and value != 'Semua'}
+        by_position = positions[by]
+
+        with self._lock:
+            groups = {}
+            for cell, sketch in self.sketches.items():
+                if any(str(cell[i]) != value for i, value in active.items()):
+                    continue
+                group = groups.get(cell[by_position])
+                if group is None:
+                    group = groups[cell[by_position]] = KLLSketch(self.k)
+                group.merge(sketch)
+        # Kelompok diurutkan menurut urutan kategori jika tersedia, selain itu menurut nilainya
+        order = self.category_orders.get(by)
+        if order is not None:
+            return {group: groups[group] for group in order if group in groups}
+        return dict(sorted(groups.items()))
+
+    def quantiles(self, qs=(0.5, 0.9, 0.99), by='hour', **filters):
+        """
+        Fungsi untuk menghitung tabel kuantil per kelompok dari sketsa yang digabung.
+        """
+        return quantile_table(self.merged(by=by, **filters), by, qs)
+
+
+def quantile_table(sketches, by, qs=(0.5, 0.9, 0.99)):
+    """
+    Fungsi untuk menyusun tabel kuantil dari sketsa yang sudah dikelompokkan.
+    """
+    columns = [f'p{int(q * 100)}' for q in qs]
+    rows = []
+    for group, sketch in sketches.items():
+        row = {by: group, 'count': sketch.count}
+        row.update(dict(zip(columns, sketch.quantiles(qs))))
+        rows.append(row)
+    return pd.DataFrame(rows, columns=[by, 'count'] + columns)
+
+
+def box_stats(sketch, label):
+    """
+    Fungsi untuk menyusun statistik box plot (matplotlib bxp) dari sebuah sketsa.
+    Whisker menggunakan persentil 5 dan 95.
+    """
+    p5, q1, med, q3, p95 = sketch.quantiles([0.05, 0.25, 0.5, 0.75, 0.95])
+    return {'label': label, 'whislo': p5, 'q1': q1, 'med': med, 'q3': q3, 'whishi': p95, 'fliers': []}
+
+
+def violin_stats(sketch, points=100):
+    """
+    Fungsi untuk menyusun statistik violin plot (matplotlib violin) dari sebuah sketsa.
+    Kepadatan diperkirakan dengan KDE Gaussian berbobot atas item sketsa.
+    """
+    values, weights = sketch.weighted_items()
+    mean = np.average(values, weights=weights)
+    std = np.sqrt(np.average((values - mean) ** 2, weights=weights))
+    # Lebar pita Silverman berdasarkan jumlah data asli
+    bandwidth = max(1.06 * std * sketch.count ** (-1 / 5), 1.0)
+    coords = np.linspace(values.min(), values.max(), points)
+    density = (weights[None, :] * np.exp(-0.5 * ((coords[:, None] - values[None, :]) / bandwidth) ** 2)).sum(axis=1)
+    density /= weights.sum() * bandwidth * np.sqrt(2 * np.pi)
+    return {
+        'coords': coords,
+        'vals': density,
+        'mean': mean,
+        'median': sketch.quantiles([0.5])[0],
+        'min': values.min(),
+        'max': values.max()
+    }
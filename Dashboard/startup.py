@@ -0,0 +1,92 @@
+import importlib
+import os
+import time
+
+# Penanda apakah eksekusi skrip saat ini adalah yang pertama dalam proses ini
+_first_run = True
+
+
+class LazyModule:
+    """
+    Proxy modul yang baru diimpor saat atributnya pertama kali diakses.
+    Digunakan agar library plotting tidak diimpor sebelum grafik benar-benar dibuat.
+    """
+
+    def __init__(self, name, setup=None, profiler=None):
+        self._name = name
+        self._setup = setup
+        self._profiler = profiler
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            start = time.perf_counter()
+            if self._setup is not None:
+                self._setup()
+            self._module = importlib.import_module(self._name)
+            if self._profiler is not None:
+                self._profiler.record_import(self._name, time.perf_counter() - start)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+class StartupProfiler:
+    """
+    Profiler sederhana untuk mencatat waktu impor dan waktu tampilan pertama (first paint)
+    lalu membandingkannya dengan anggaran waktu yang dapat dikonfigurasi.
+    """
+
+    def __init__(self, script_start, budget_ms=None, first_paint_budget_ms=None):
+        global _first_run
+        self.script_start = script_start
+        self.cold_start = _first_run
+        _first_run = False
+
+        # Anggaran waktu dapat diatur melalui environment variable
+        self.import_budget_ms = budget_ms if budget_ms is not None else \
+            float(os.environ.get("DASHBOARD_IMPORT_BUDGET_MS", 1500))
+        self.first_paint_budget_ms = first_paint_budget_ms if first_paint_budget_ms is not None else \
+            float(os.environ.get("DASHBOARD_FIRST_PAINT_BUDGET_MS", 3000))
+
+        self.imports = {}
+        self.marks = {}
+
+    def record_import(self, name, seconds):
+        self.imports[name] = self.imports.get(name, 0.0) + seconds * 1000
+
+    def mark(self, name):
+        """
+        Fungsi untuk mencatat waktu (ms) sejak skrip mulai dieksekusi.
+        Hanya penanda pertama dengan nama yang sama yang disimpan.
+        """
+        if name not in self.marks:
+            self.marks[name] = (time.perf_counter() - self.script_start) * 1000
+
+    def report(self):
+        """
+        Fungsi untuk menyusun laporan waktu startup beserta status anggarannya.
+        """
+        import_ms = sum(self.imports.values())
+        first_paint_ms = self.marks.get("first_paint")
+        return {
+            "cold_start": self.cold_start,
+            "import_ms": import_ms,
+            "import_budget_ms": self.import_budget_ms,
+            "import_within_budget": import_ms <= self.import_budget_ms,
+            "first_paint_ms": first_paint_ms,
+            "first_paint_budget_ms": self.first_paint_budget_ms,
+            "first_paint_within_budget": first_paint_ms is None or first_paint_ms <= self.first_paint_budget_ms,
+            "imports": dict(self.imports),
+            "marks": dict(self.marks),
+        }
+
+
+def read_asset(name, mode="r"):
+    """
+    Fungsi untuk membaca file aset statis yang dibundel bersama dashboard.
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", name)
+    with open(path, mode, encoding=None if "b" in mode else "utf-8") as f:
+        return f.read()
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+from data_processing import FILTER_KEYS
+
+# Kolom numerik cuaca dan penggunaan yang disimpan statistiknya
+STAT_COLUMNS = ['temperature', 'atemp', 'humidity', 'wind_speed',
+                'casual_users', 'registered_users', 'total_rentals']
+
+
+class SufficientStatsStore:
+    """
+    Penyimpanan statistik cukup (n, jumlah, jumlah kuadrat, dan hasil kali silang)
+    per sel filter. Matriks korelasi dan kemiringan regresi untuk filter apa pun
+    disusun dengan menjumlahkan sel yang cocok, tanpa membaca ulang data mentah.
+    """
+
+    def __init__(self, df, keys=FILTER_KEYS, columns=STAT_COLUMNS):
+        self.keys = list(keys)
+        self.columns = list(columns)
+        k = len(self.columns)
+
+        # Nomor sel untuk setiap baris berdasarkan kombinasi dimensi filter
+        grouped = df.groupby(self.keys, observed=True, sort=False)
+        codes = grouped.ngroup().to_numpy()
+        n_cells = grouped.ngroups
+
+        x = df[self.columns].to_numpy(dtype=np.float64)
+        cross = (x[:, :, None] * x[:, None, :]).reshape(len(x), k * k)
+
+        self.counts = np.bincount(codes, minlength=n_cells).astype(np.float64)
+        self.sums = np.zeros((n_cells, k))
+        self.cross_products = np.zeros((n_cells, k * k))
+        np.add.at(self.sums, codes, x)
+        np.add.at(self.cross_products, codes, cross)
+        self.cross_products = self.cross_products.reshape(n_cells, k, k)
+
+        # Nilai dimensi filter untuk setiap sel
+        cells = df[self.keys].copy()
+        cells['_cell'] = codes
+        self.cells = cells.drop_duplicates('_cell').sort_values('_cell').drop(columns='_cell')
+        for key in self.keys:
+            self.cells[key] = self.cells[key].astype(str)
+        self.cells = self.cells.reset_index(drop=True)
+
+    def _select(self, filters):
+        mask = np.ones(len(self.cells), dtype=bool)
+        for key, value in filters.items():
+            if value is None or value == 'Semua':
+                continue
+            mask &= (self.cells[key] == str(value)).to_numpy()
+        return mask
+
+    def query(self, **filters):
+        """
+        Fungsi untuk menjumlahkan statistik dari sel-sel yang cocok dengan filter.
+        Nilai filter None atau 'Semua' berarti tidak difilter.
+        """
+        mask = self._select(filters)
+        n = self.counts[mask].sum()
+        sums = self.sums[mask].sum(axis=0)
+        cross_products = self.cross_products[mask].sum(axis=0)
+        return n, sums, cross_products
+
+    def means(self, **filters):
+        """
+        Fungsi untuk menghitung rata-rata setiap kolom dari statistik cukup.
+        """
+        n, sums, _ = self.query(**filters)
+        values = sums / n if n > 0 else np.full(len(self.columns), np.nan)
+        return pd.Series(values, index=self.columns)
+
+    def covariance_matrix(self, **filters):
+        """
+        Fungsi untuk menghitung matriks kovarians sampel dari statistik cukup.
+        """
+        n, sums, cross_products = self.query(**filters)
+        if n < 2:
+            cov = np.full((len(self.columns), len(self.columns)), np.nan)
+        else:
+            cov = (cross_products - np.outer(sums, sums) / n) / (n - 1)
+        return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+
+    def correlation_matrix(self, **filters):
+        """
+        Fungsi untuk menghitung matriks korelasi Pearson dari statistik cukup.
+        """
+        cov = self.covariance_matrix(**filters).to_numpy()
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = cov / np.outer(std, std)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def regression_slope(self, x, y, **filters):
+        """
+        Fungsi untuk menghitung kemiringan regresi linear y terhadap x.
+        """
+        cov = self.covariance_matrix(**filters)
+        if cov.loc[x, x] == 0:
+            return np.nan
+        return cov.loc[x, y] / cov.loc[x, x]